@@ -11,7 +11,7 @@ import ssl
 import httpx
 
 
-@dataclass
+@dataclass(slots=True)
 class _SSLCache:
     """Mutable container for the cached SSLContext and its async lock."""
 
@@ -18,6 +18,26 @@ from ._http import _build_url, _get_client
 from .exceptions import SpanPanelAPIError, SpanPanelAuthError, SpanPanelConnectionError, SpanPanelTimeoutError
 from .models import HomieSchemaTypes, V2AuthResponse, V2HomieSchema, V2StatusInfo
 
+# Fields that must be present in a successful /api/v2/auth/register response.
+# Checked in a single set difference so a malformed body fails fast with a
+# SpanPanelAPIError instead of a bare KeyError mid-construction.
+_REGISTER_REQUIRED_FIELDS = frozenset(
+    (
+        "accessToken",
+        "tokenType",
+        "iatMs",
+        "ebusBrokerUsername",
+        "ebusBrokerPassword",
+        "ebusBrokerHost",
+        "ebusBrokerMqttsPort",
+        "ebusBrokerWsPort",
+        "ebusBrokerWssPort",
+        "hostname",
+        "serialNumber",
+        "hopPassphrase",
+    )
+)
+
 
 def _str(val: object) -> str:
     """Extract a string from a JSON-decoded value."""
@@ -69,7 +89,7 @@ async def register_v2(
         SpanPanelAuthError: Invalid passphrase or auth failure
         SpanPanelConnectionError: Cannot reach panel
         SpanPanelTimeoutError: Request timed out
-        SpanPanelAPIError: Unexpected response
+        SpanPanelAPIError: Unexpected response or missing required fields
     """
     url = _build_url(host, port, "/api/v2/auth/register")
     # The panel requires unique client names — append a random suffix.
@@ -95,6 +115,9 @@ async def register_v2(
         raise SpanPanelAPIError(f"Unexpected response from /api/v2/auth/register: HTTP {response.status_code}")
 
     data: dict[str, object] = response.json()
+    missing = _REGISTER_REQUIRED_FIELDS - data.keys()
+    if missing:
+        raise SpanPanelAPIError(f"Incomplete response from /api/v2/auth/register: missing {', '.join(sorted(missing))}")
     return V2AuthResponse(
         access_token=_str(data["accessToken"]),
         token_type=_str(data["tokenType"]),
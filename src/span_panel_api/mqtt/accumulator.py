@@ -7,11 +7,12 @@ query API for higher-level consumers.
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 import enum
 import json
 import logging
 import time
+from types import MappingProxyType
 
 from .const import HOMIE_STATE_DISCONNECTED, HOMIE_STATE_LOST, HOMIE_STATE_READY, TOPIC_PREFIX
 
@@ -55,6 +56,12 @@ class HomiePropertyAccumulator:
 
         # Node type mapping from $description
         self._node_types: dict[str, str] = {}
+        self._node_types_view: Mapping[str, str] = MappingProxyType(self._node_types)
+        # Raw payload the current _node_types mapping was parsed from
+        self._description_payload: str | None = None
+        # Memoized find_node_by_type() results; only valid for the current
+        # _node_types mapping, so cleared whenever $description is parsed.
+        self._first_node_by_type: dict[str, str | None] = {}
 
         # Dirty tracking
         self._dirty_nodes: set[str] = set()
@@ -115,26 +122,35 @@ class HomiePropertyAccumulator:
 
     def get_prop(self, node_id: str, prop_id: str, default: str = "") -> str:
         """Get a property's reported value."""
-        return self._property_values.get(node_id, {}).get(prop_id, default)
+        values = self._property_values.get(node_id)
+        return default if values is None else values.get(prop_id, default)
 
     def get_timestamp(self, node_id: str, prop_id: str) -> int:
         """Get the epoch timestamp of a property's last update."""
-        return self._property_timestamps.get(node_id, {}).get(prop_id, 0)
+        timestamps = self._property_timestamps.get(node_id)
+        return 0 if timestamps is None else timestamps.get(prop_id, 0)
 
     def get_target(self, node_id: str, prop_id: str) -> str | None:
         """Get a property's target value, or None if no target set."""
-        return self._target_values.get(node_id, {}).get(prop_id)
+        targets = self._target_values.get(node_id)
+        return None if targets is None else targets.get(prop_id)
 
     def has_target(self, node_id: str, prop_id: str) -> bool:
         """True if a target value exists for the given property."""
-        return prop_id in self._target_values.get(node_id, {})
+        targets = self._target_values.get(node_id)
+        return targets is not None and prop_id in targets
 
     def find_node_by_type(self, type_str: str) -> str | None:
         """Find the first node ID matching a given type string."""
+        if type_str in self._first_node_by_type:
+            return self._first_node_by_type[type_str]
+        found: str | None = None
         for node_id, node_type in self._node_types.items():
             if node_type == type_str:
-                return node_id
-        return None
+                found = node_id
+                break
+        self._first_node_by_type[type_str] = found
+        return found
 
     def nodes_by_type(self, type_str: str) -> list[str]:
         """Return all node IDs matching a given type string."""
@@ -148,6 +164,14 @@ class HomiePropertyAccumulator:
         """Return a copy of the node_id → type mapping."""
         return dict(self._node_types)
 
+    def node_types_view(self) -> Mapping[str, str]:
+        """Return a read-only live view of the node_id → type mapping.
+
+        Unlike ``all_node_types()`` nothing is copied: the view reflects
+        later ``$description`` changes and must not be kept as a snapshot.
+        """
+        return self._node_types_view
+
     def dirty_node_ids(self) -> frozenset[str]:
         """Return the set of node IDs with changed properties since last mark_clean."""
         return frozenset(self._dirty_nodes)
@@ -200,28 +224,40 @@ class HomiePropertyAccumulator:
 
     def _handle_description(self, payload: str) -> None:
         """Parse $description JSON and extract node type mappings."""
-        try:
-            desc = json.loads(payload)
-        except json.JSONDecodeError:
-            _LOGGER.warning("Invalid $description JSON")
-            return
+        # $description is retained, so it is re-delivered on every
+        # (re)subscribe and panel reboot; an identical payload cannot change
+        # the node map, so only the dirty marking and lifecycle steps run.
+        if payload != self._description_payload:
+            # Valid JSON that starts with "{" is an object, so anything else
+            # can be rejected without paying for a full parse.
+            if not payload.lstrip().startswith("{"):
+                _LOGGER.warning("Invalid $description: not a JSON object")
+                return
+            try:
+                desc = json.loads(payload)
+            except json.JSONDecodeError:
+                _LOGGER.warning("Invalid $description JSON")
+                return
 
-        self._received_description = True
-        self._node_types.clear()
+            self._node_types.clear()
+            self._first_node_by_type.clear()
 
-        nodes = desc.get("nodes", {})
-        if isinstance(nodes, dict):
-            for node_id, node_def in nodes.items():
-                if isinstance(node_def, dict):
-                    node_type = node_def.get("type", "")
-                    if isinstance(node_type, str):
-                        self._node_types[str(node_id)] = node_type
+            nodes = desc.get("nodes", {})
+            if isinstance(nodes, dict):
+                for node_id, node_def in nodes.items():
+                    if isinstance(node_def, dict):
+                        node_type = node_def.get("type", "")
+                        if isinstance(node_type, str):
+                            self._node_types[str(node_id)] = node_type
+
+            self._description_payload = payload
+            _LOGGER.debug("Parsed $description with %d nodes", len(self._node_types))
+
+        self._received_description = True
 
         # Mark all known nodes dirty
         self._dirty_nodes.update(self._node_types.keys())
 
-        _LOGGER.debug("Parsed $description with %d nodes", len(self._node_types))
-
         # Lifecycle transition
         if self._received_state_ready:
             self._transition_to_ready()
@@ -230,33 +266,35 @@ class HomiePropertyAccumulator:
 
     def _handle_property(self, node_id: str, prop_id: str, value: str) -> None:
         """Handle a reported property value update."""
-        now_s = int(time.time())
-
-        if node_id not in self._property_values:
-            self._property_values[node_id] = {}
+        values = self._property_values.get(node_id)
+        if values is None:
+            values = self._property_values[node_id] = {}
             self._property_timestamps[node_id] = {}
 
-        old_value = self._property_values[node_id].get(prop_id)
+        old_value = values.get(prop_id)
 
         if old_value == value:
             return  # no change — no dirty, no callbacks, no timestamp bump
 
-        self._property_values[node_id][prop_id] = value
-        self._property_timestamps[node_id][prop_id] = now_s
+        # Read the clock only once a change is confirmed; retained and
+        # repeated publishes of an unchanged value never need it.
+        values[prop_id] = value
+        self._property_timestamps[node_id][prop_id] = int(time.time())
         self._dirty_nodes.add(node_id)
 
         self._fire_callbacks(node_id, prop_id, value, old_value)
 
     def _handle_target(self, node_id: str, prop_id: str, value: str) -> None:
         """Handle a $target property value."""
-        if node_id not in self._target_values:
-            self._target_values[node_id] = {}
+        targets = self._target_values.get(node_id)
+        if targets is None:
+            targets = self._target_values[node_id] = {}
 
-        old_target = self._target_values[node_id].get(prop_id)
+        old_target = targets.get(prop_id)
         if old_target == value:
             return  # no change
 
-        self._target_values[node_id][prop_id] = value
+        targets[prop_id] = value
         self._dirty_nodes.add(node_id)
 
     def _transition_to_ready(self) -> None:
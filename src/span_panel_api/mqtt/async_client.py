@@ -54,6 +54,8 @@ class NullLock:
     trivial no-ops since the client runs on a single event loop thread.
     """
 
+    __slots__ = ()
+
     def __enter__(self) -> NullLock:
         """Enter the lock (no-op)."""
         return self
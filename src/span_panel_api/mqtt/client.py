@@ -11,7 +11,6 @@ import asyncio
 from collections.abc import Awaitable, Callable
 import contextlib
 import logging
-import time
 
 from ..auth import get_homie_schema
 from ..exceptions import SpanPanelConnectionError, SpanPanelServerError, SpanPanelStaleDataError
@@ -29,7 +28,6 @@ _LOGGER = logging.getLogger(__name__)
 # How long to wait for circuit name properties after device ready.
 # Retained messages typically arrive within 1-2s, but allow headroom.
 _CIRCUIT_NAMES_TIMEOUT_S = 10.0
-_CIRCUIT_NAMES_POLL_INTERVAL_S = 0.25
 
 
 class SpanMqttClient:
@@ -120,7 +118,8 @@ class SpanMqttClient:
 
         # Detect schema drift from previous connection
         new_hash = schema.types_schema_hash
-        if self._schema_hash is not None and new_hash != self._schema_hash:
+        schema_changed = new_hash != self._schema_hash
+        if self._schema_hash is not None and schema_changed:
             _LOGGER.debug(
                 "Homie schema hash changed: %s → %s (firmware update may have modified the property schema)",
                 self._schema_hash,
@@ -131,8 +130,10 @@ class SpanMqttClient:
         self._schema_hash = new_hash
         self._previous_schema_types = schema.types
 
-        # Build transport-agnostic field metadata from schema
-        self._field_metadata = build_field_metadata(schema.types)
+        # Build transport-agnostic field metadata from schema; a reconnect
+        # against an unchanged schema keeps the metadata already built.
+        if self._field_metadata is None or schema_changed:
+            self._field_metadata = build_field_metadata(schema.types)
 
         _LOGGER.debug(
             "MQTT: Creating bridge to %s:%s (serial=%s)",
@@ -373,26 +374,38 @@ class SpanMqttClient:
         """Wait for all circuit-like nodes to have a ``name`` property.
 
         Retained MQTT messages may arrive after the Homie device transitions
-        to ready. This polls the HomieDeviceConsumer at short intervals and
-        returns as soon as all circuit names are populated, or when the
-        timeout elapses (non-fatal — entities will use fallback names).
+        to ready. The circuits still missing a name are collected once, then
+        each ``name`` property update removes its node from that set; this
+        returns as soon as the set is empty, or when the timeout elapses
+        (non-fatal — entities will use fallback names).
         """
         homie = self._require_homie()
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            missing = homie.circuit_nodes_missing_names()
-            if not missing:
-                _LOGGER.debug("All circuit names received")
-                return
-            await asyncio.sleep(_CIRCUIT_NAMES_POLL_INTERVAL_S)
-
-        still_missing = homie.circuit_nodes_missing_names()
-        if still_missing:
-            _LOGGER.warning(
-                "Timed out waiting for circuit names (%d still missing): %s",
-                len(still_missing),
-                still_missing[:5],
-            )
+        missing = set(homie.circuit_nodes_missing_names())
+        if missing and self._accumulator is not None:
+            all_named = asyncio.Event()
+
+            def on_property(node_id: str, prop_id: str, value: str, _old_value: str | None) -> None:
+                if prop_id == "name" and value:
+                    missing.discard(node_id)
+                    if not missing:
+                        all_named.set()
+
+            unregister = self._accumulator.register_property_callback(on_property)
+            try:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(all_named.wait(), timeout=timeout)
+            finally:
+                unregister()
+
+        if not missing:
+            _LOGGER.debug("All circuit names received")
+            return
+
+        _LOGGER.warning(
+            "Timed out waiting for circuit names (%d still missing): %s",
+            len(missing),
+            sorted(missing)[:5],
+        )
 
     def _create_dispatch_task(self) -> None:
         """Create a background task to build and dispatch a snapshot."""
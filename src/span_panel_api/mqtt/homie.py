@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 import dataclasses
+from dataclasses import dataclass
 import logging
 import time
 from typing import ClassVar
@@ -58,6 +59,34 @@ def _parse_int(value: str, default: int = 0) -> int:
         return default
 
 
+@dataclass(frozen=True, slots=True)
+class _FeedMetadata:
+    """Circuit annotation derived from a PV/EVSE node's ``feed`` reference."""
+
+    device_type: str = "circuit"  # "circuit" | "pv" | "evse"
+    relative_position: str = ""  # "IN_PANEL" | "UPSTREAM" | "DOWNSTREAM" | ""
+
+
+_NO_FEED_METADATA = _FeedMetadata()
+
+
+def _unmapped_tab_snapshot(tab: int, circuit_id: str, name: str) -> SpanCircuitSnapshot:
+    """Build the zero-power placeholder circuit for an unoccupied tab."""
+    return SpanCircuitSnapshot(
+        circuit_id=circuit_id,
+        name=name,
+        relay_state="CLOSED",
+        instant_power_w=0.0,
+        produced_energy_wh=0.0,
+        consumed_energy_wh=0.0,
+        tabs=[tab],
+        priority="UNKNOWN",
+        is_user_controllable=False,
+        is_sheddable=False,
+        is_never_backup=False,
+    )
+
+
 class HomieDeviceConsumer:
     """Build SPAN-specific snapshots from accumulated Homie property state.
 
@@ -69,6 +98,17 @@ class HomieDeviceConsumer:
         self._acc = accumulator
         self._panel_size = panel_size
         self._cached_snapshot: SpanPanelSnapshot | None = None
+        # Feed annotations from the last full build.  They only change when a
+        # PV/EVSE node does, and those node types always force a full build.
+        self._feed_metadata: dict[str, _FeedMetadata] = {}
+        # Unmapped tab ids and names never change for a given position, so
+        # format them once; index ``tab - 1`` holds that position's labels.
+        # The snapshots themselves are built per rebuild because
+        # SpanCircuitSnapshot.tabs is a mutable list owned by the caller.
+        self._unmapped_tab_labels: tuple[tuple[str, str], ...] = tuple(
+            (f"unmapped_tab_{tab}", f"Unmapped Tab {tab}") for tab in range(1, panel_size + 1)
+        )
+        self._unmapped_tab_ids: frozenset[str] = frozenset(circuit_id for circuit_id, _ in self._unmapped_tab_labels)
 
     # -- Delegation to accumulator -------------------------------------------
     # These thin wrappers allow SpanMqttClient (and legacy test code) to
@@ -129,7 +169,7 @@ class HomieDeviceConsumer:
             self._acc.mark_clean()
             return self._cached_snapshot
 
-        node_types = self._acc.all_node_types()
+        node_types = self._acc.node_types_view()
         needs_full = self._cached_snapshot is None or any(
             node_types.get(nid, "") in self._PANEL_LEVEL_TYPES or nid not in node_types for nid in dirty
         )
@@ -145,19 +185,17 @@ class HomieDeviceConsumer:
             raise RuntimeError("_rebuild_dirty_circuits called without a cached snapshot")
         cached = self._cached_snapshot
 
-        feed_metadata = self._build_feed_metadata()
+        feed_metadata = self._feed_metadata
         updated_circuits: dict[str, SpanCircuitSnapshot] = {}
         # Keep only non-unmapped circuits from cache, rebuild dirty ones
         for cid, circ in cached.circuits.items():
-            if cid.startswith("unmapped_tab_"):
+            if cid in self._unmapped_tab_ids:
                 continue  # drop old unmapped entries; will recompute below
             updated_circuits[cid] = circ
         for node_id in dirty:
             if self._is_circuit_node(node_id):
-                meta = feed_metadata.get(node_id, {})
-                device_type = meta.get("device_type", "circuit")
-                relative_position = meta.get("relative_position", "")
-                circuit = self._build_circuit(node_id, device_type, relative_position)
+                meta = feed_metadata.get(node_id, _NO_FEED_METADATA)
+                circuit = self._build_circuit(node_id, meta.device_type, meta.relative_position)
                 updated_circuits[circuit.circuit_id] = circuit
 
         # Recompute unmapped tabs based on current circuit set
@@ -180,13 +218,13 @@ class HomieDeviceConsumer:
         }
         target_type = typed_map.get(direction)
         if target_type:
-            node_types = self._acc.all_node_types()
+            node_types = self._acc.node_types_view()
             for node_id, node_type in node_types.items():
                 if node_type == target_type:
                     return node_id
 
         # Generic variant (single TYPE_LUGS with direction property)
-        node_types = self._acc.all_node_types()
+        node_types = self._acc.node_types_view()
         for node_id, node_type in node_types.items():
             if node_type == TYPE_LUGS:
                 prop_dir = self._acc.get_prop(node_id, "direction")
@@ -211,84 +249,82 @@ class HomieDeviceConsumer:
         """Check if node is a circuit device."""
         return self._acc.get_node_type(node_id) in self._CIRCUIT_LIKE_TYPES
 
-    def _build_feed_metadata(self) -> dict[str, dict[str, str]]:
+    def _build_feed_metadata(self) -> dict[str, _FeedMetadata]:
         """Build mapping of circuit node_id → metadata from PV/EVSE feed references.
 
-        Returns dict keyed by circuit node_id with values containing:
-          - device_type: "pv" | "evse"
-          - relative_position: "IN_PANEL" | "UPSTREAM" | "DOWNSTREAM" | ""
+        Returns dict keyed by circuit node_id; circuits with no PV/EVSE
+        feed reference are absent (callers fall back to ``_NO_FEED_METADATA``).
         """
-        feed_meta: dict[str, dict[str, str]] = {}
-        for node_id, node_type in self._acc.all_node_types().items():
+        feed_meta: dict[str, _FeedMetadata] = {}
+        for node_id, node_type in self._acc.node_types_view().items():
             device_type = self._FEED_TYPE_MAP.get(node_type)
             if device_type:
                 feed_circuit = self._acc.get_prop(node_id, "feed")
                 if feed_circuit:
                     rel_pos = self._acc.get_prop(node_id, "relative-position")
-                    feed_meta[feed_circuit] = {
-                        "device_type": device_type,
-                        "relative_position": rel_pos.upper() if rel_pos else "",
-                    }
+                    feed_meta[feed_circuit] = _FeedMetadata(
+                        device_type=device_type,
+                        relative_position=rel_pos.upper() if rel_pos else "",
+                    )
         return feed_meta
 
     def _build_circuit(self, node_id: str, device_type: str = "circuit", relative_position: str = "") -> SpanCircuitSnapshot:
         """Build a circuit snapshot from accumulated properties."""
         circuit_id = normalize_circuit_id(node_id)
+        # Runs once per circuit on every full rebuild; bind the accessors once.
+        get_prop = self._acc.get_prop
+        get_timestamp = self._acc.get_timestamp
 
         # active-power is in watts; negate so positive = consumption.
         # Guard against -0.0 creeping in when raw_power_w is 0.0.
-        raw_power_w = _parse_float(self._acc.get_prop(node_id, "active-power"))
+        raw_power_w = _parse_float(get_prop(node_id, "active-power"))
         instant_power_w = 0.0 if raw_power_w == 0.0 else -raw_power_w
 
         # Energy: exported-energy = consumption (panel exports TO circuit)
-        consumed_wh = _parse_float(self._acc.get_prop(node_id, "exported-energy"))
+        consumed_wh = _parse_float(get_prop(node_id, "exported-energy"))
         # imported-energy = production (panel imports FROM circuit)
-        produced_wh = _parse_float(self._acc.get_prop(node_id, "imported-energy"))
+        produced_wh = _parse_float(get_prop(node_id, "imported-energy"))
 
         # Tabs: derived from space + dipole
         # Dipole circuits occupy two consecutive spaces on the same bus bar
         # side: [space, space + 2] (odd+odd or even+even)
-        space_val = self._acc.get_prop(node_id, "space")
-        is_dipole = _parse_bool(self._acc.get_prop(node_id, "dipole"))
+        space_val = get_prop(node_id, "space")
+        is_dipole = _parse_bool(get_prop(node_id, "dipole"))
         tabs: list[int] = []
         if space_val:
             space = _parse_int(space_val)
             tabs = [space, space + 2] if is_dipole else [space]
 
-        always_on = _parse_bool(self._acc.get_prop(node_id, "always-on"))
+        always_on = _parse_bool(get_prop(node_id, "always-on"))
+        current = get_prop(node_id, "current")
+        breaker_rating = get_prop(node_id, "breaker-rating")
 
         # Timestamps from MQTT arrival time
         energy_ts = max(
-            self._acc.get_timestamp(node_id, "exported-energy"),
-            self._acc.get_timestamp(node_id, "imported-energy"),
+            get_timestamp(node_id, "exported-energy"),
+            get_timestamp(node_id, "imported-energy"),
         )
-        power_ts = self._acc.get_timestamp(node_id, "active-power")
+        power_ts = get_timestamp(node_id, "active-power")
 
         return SpanCircuitSnapshot(
             circuit_id=circuit_id,
-            name=self._acc.get_prop(node_id, "name"),
-            relay_state=self._acc.get_prop(node_id, "relay", "UNKNOWN"),
+            name=get_prop(node_id, "name"),
+            relay_state=get_prop(node_id, "relay", "UNKNOWN"),
             instant_power_w=instant_power_w,
             produced_energy_wh=produced_wh,
             consumed_energy_wh=consumed_wh,
             tabs=tabs,
-            priority=self._acc.get_prop(node_id, "shed-priority", "UNKNOWN"),
+            priority=get_prop(node_id, "shed-priority", "UNKNOWN"),
             is_user_controllable=not always_on,
-            is_sheddable=_parse_bool(self._acc.get_prop(node_id, "sheddable")),
-            is_never_backup=_parse_bool(self._acc.get_prop(node_id, "never-backup")),
+            is_sheddable=_parse_bool(get_prop(node_id, "sheddable")),
+            is_never_backup=_parse_bool(get_prop(node_id, "never-backup")),
             device_type=device_type,
             relative_position=relative_position,
-            is_240v=_parse_bool(self._acc.get_prop(node_id, "dipole")),
-            current_a=(
-                _parse_float(self._acc.get_prop(node_id, "current")) if self._acc.get_prop(node_id, "current") else None
-            ),
-            breaker_rating_a=(
-                _parse_float(self._acc.get_prop(node_id, "breaker-rating"))
-                if self._acc.get_prop(node_id, "breaker-rating")
-                else None
-            ),
+            is_240v=is_dipole,
+            current_a=_parse_float(current) if current else None,
+            breaker_rating_a=_parse_float(breaker_rating) if breaker_rating else None,
             always_on=always_on,
-            relay_requester=self._acc.get_prop(node_id, "relay-requester", "UNKNOWN"),
+            relay_requester=get_prop(node_id, "relay-requester", "UNKNOWN"),
             energy_accum_update_time_s=energy_ts,
             instant_power_update_time_s=power_ts,
             relay_state_target=self._acc.get_target(node_id, "relay"),
@@ -347,7 +383,7 @@ class HomieDeviceConsumer:
     def _build_evse_devices(self) -> dict[str, SpanEvseSnapshot]:
         """Build EVSE snapshots from all EVSE metadata nodes."""
         result: dict[str, SpanEvseSnapshot] = {}
-        for node_id, node_type in self._acc.all_node_types().items():
+        for node_id, node_type in self._acc.node_types_view().items():
             if node_type != TYPE_EVSE:
                 continue
             feed = self._acc.get_prop(node_id, "feed")
@@ -368,6 +404,14 @@ class HomieDeviceConsumer:
             )
         return result
 
+    # Off-grid run config by dominant power source.  The keys are also the
+    # non-grid sources that make grid-power exchange decide dsm_state.
+    _OFF_GRID_RUN_CONFIG: ClassVar[dict[str, str]] = {
+        "BATTERY": "PANEL_BACKUP",
+        "PV": "PANEL_OFF_GRID",
+        "GENERATOR": "PANEL_OFF_GRID",
+    }
+
     def _derive_dsm_state(self, core_node: str | None, grid_power: float, power_flow_grid: float | None) -> str:
         """Derive dsm_state from multiple signals.
 
@@ -392,7 +436,7 @@ class HomieDeviceConsumer:
             if dps == "GRID":
                 return "DSM_ON_GRID"
 
-            if dps in ("BATTERY", "PV", "GENERATOR"):
+            if dps in self._OFF_GRID_RUN_CONFIG:
                 grid_exchanging = abs(grid_power) > _GRID_POWER_EPSILON_W or (
                     power_flow_grid is not None and abs(power_flow_grid) > _GRID_POWER_EPSILON_W
                 )
@@ -400,7 +444,8 @@ class HomieDeviceConsumer:
 
         return "UNKNOWN"
 
-    def _derive_run_config(self, dsm_state: str, grid_islandable: bool | None, dps: str | None) -> str:
+    @classmethod
+    def _derive_run_config(cls, dsm_state: str, grid_islandable: bool | None, dps: str | None) -> str:
         """Derive current_run_config from grid state, islandability, and power source.
 
         Decision table:
@@ -413,14 +458,8 @@ class HomieDeviceConsumer:
         if dsm_state == "DSM_ON_GRID":
             return "PANEL_ON_GRID"
 
-        if dsm_state == "DSM_OFF_GRID":
-            if not grid_islandable:
-                return "UNKNOWN"
-            if dps == "BATTERY":
-                return "PANEL_BACKUP"
-            if dps in ("PV", "GENERATOR"):
-                return "PANEL_OFF_GRID"
-            return "UNKNOWN"
+        if dsm_state == "DSM_OFF_GRID" and grid_islandable and dps is not None:
+            return cls._OFF_GRID_RUN_CONFIG.get(dps, "UNKNOWN")
 
         return "UNKNOWN"
 
@@ -428,32 +467,26 @@ class HomieDeviceConsumer:
         self,
         circuits: dict[str, SpanCircuitSnapshot],
     ) -> dict[str, SpanCircuitSnapshot]:
-        """Synthesize unmapped tab entries for breaker positions with no circuit.
+        """Select unmapped tab entries for breaker positions with no circuit.
 
-        Creates zero-power SpanCircuitSnapshot entries for unoccupied positions
-        up to ``self._panel_size``.
+        Returns fresh zero-power SpanCircuitSnapshot entries for
+        unoccupied positions up to ``self._panel_size``.
         """
-        occupied_tabs: set[int] = set()
+        # Occupied positions as a bitmask: bit ``tab`` is set when a circuit
+        # occupies that breaker position.  Spaces outside 1..panel_size from
+        # a malformed payload cannot affect the result, so they set no bit
+        # (and an absurdly large space never allocates a huge int).
+        panel_size = self._panel_size
+        occupied_mask = 0
         for circuit in circuits.values():
-            occupied_tabs.update(circuit.tabs)
+            for tab in circuit.tabs:
+                if 0 < tab <= panel_size:
+                    occupied_mask |= 1 << tab
 
         unmapped: dict[str, SpanCircuitSnapshot] = {}
-        for tab in range(1, self._panel_size + 1):
-            if tab not in occupied_tabs:
-                circuit_id = f"unmapped_tab_{tab}"
-                unmapped[circuit_id] = SpanCircuitSnapshot(
-                    circuit_id=circuit_id,
-                    name=f"Unmapped Tab {tab}",
-                    relay_state="CLOSED",
-                    instant_power_w=0.0,
-                    produced_energy_wh=0.0,
-                    consumed_energy_wh=0.0,
-                    tabs=[tab],
-                    priority="UNKNOWN",
-                    is_user_controllable=False,
-                    is_sheddable=False,
-                    is_never_backup=False,
-                )
+        for tab, (circuit_id, name) in enumerate(self._unmapped_tab_labels, start=1):
+            if not (occupied_mask >> tab) & 1:
+                unmapped[circuit_id] = _unmapped_tab_snapshot(tab, circuit_id, name)
 
         return unmapped
 
@@ -558,16 +591,14 @@ class HomieDeviceConsumer:
             power_flow_site = _parse_float(pf_site) if pf_site else None
 
         # Build metadata annotations from PV/EVSE metadata nodes
-        feed_metadata = self._build_feed_metadata()
+        feed_metadata = self._feed_metadata = self._build_feed_metadata()
 
         # Circuits
         circuits: dict[str, SpanCircuitSnapshot] = {}
-        for node_id in self._acc.all_node_types():
+        for node_id in self._acc.node_types_view():
             if self._is_circuit_node(node_id):
-                meta = feed_metadata.get(node_id, {})
-                device_type = meta.get("device_type", "circuit")
-                relative_position = meta.get("relative_position", "")
-                circuit = self._build_circuit(node_id, device_type, relative_position)
+                meta = feed_metadata.get(node_id, _NO_FEED_METADATA)
+                circuit = self._build_circuit(node_id, meta.device_type, meta.relative_position)
                 circuits[circuit.circuit_id] = circuit
 
         # Synthesize unmapped tab entries
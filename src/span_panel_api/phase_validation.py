@@ -5,6 +5,7 @@ in SPAN panel configurations, particularly useful for solar inverter setup
 and 240V appliance validation.
 """
 
+from collections.abc import Collection
 from typing import TypedDict
 
 
@@ -19,7 +20,7 @@ class PhaseDistribution(TypedDict):
     balance_difference: int
 
 
-def get_tab_phase(tab_number: int, valid_tabs: list[int] | None = None) -> str:
+def get_tab_phase(tab_number: int, valid_tabs: Collection[int] | None = None) -> str:
     """Determine which phase (L1 or L2) a tab is connected to.
 
     SPAN panels have an alternating phase pattern vertically on each side:
@@ -28,8 +29,8 @@ def get_tab_phase(tab_number: int, valid_tabs: list[int] | None = None) -> str:
 
     Args:
         tab_number: Tab position (1-based indexing)
-        valid_tabs: Optional list of valid tab numbers from panel data.
-                   If provided, tab_number must be in this list.
+        valid_tabs: Optional collection of valid tab numbers from panel data.
+                   If provided, tab_number must be in this collection.
 
     Returns:
         "L1" or "L2" phase designation
@@ -52,13 +53,13 @@ def get_tab_phase(tab_number: int, valid_tabs: list[int] | None = None) -> str:
     return "L1" if position_in_side % 2 == 0 else "L2"
 
 
-def are_tabs_opposite_phase(tab1: int, tab2: int, valid_tabs: list[int] | None = None) -> bool:
+def are_tabs_opposite_phase(tab1: int, tab2: int, valid_tabs: Collection[int] | None = None) -> bool:
     """Check if two tabs are on opposite phases (suitable for 240V).
 
     Args:
         tab1: First tab position to check
         tab2: Second tab position to check
-        valid_tabs: Optional list of valid tab numbers from panel data
+        valid_tabs: Optional collection of valid tab numbers from panel data
 
     Returns:
         True if tabs are on opposite phases (L1 + L2), suitable for 240V
@@ -78,13 +79,13 @@ def are_tabs_opposite_phase(tab1: int, tab2: int, valid_tabs: list[int] | None =
         return False
 
 
-def validate_solar_tabs(tab1: int, tab2: int, valid_tabs: list[int] | None = None) -> tuple[bool, str]:
+def validate_solar_tabs(tab1: int, tab2: int, valid_tabs: Collection[int] | None = None) -> tuple[bool, str]:
     """Validate that solar tab configuration provides proper 240V measurement.
 
     Args:
         tab1: First solar tab number
         tab2: Second solar tab number
-        valid_tabs: Optional list of valid tab numbers from panel data
+        valid_tabs: Optional collection of valid tab numbers from panel data
 
     Returns:
         tuple of (is_valid, message) where:
@@ -111,12 +112,12 @@ def validate_solar_tabs(tab1: int, tab2: int, valid_tabs: list[int] | None = Non
         return False, f"Invalid tab configuration: {e}"
 
 
-def get_phase_distribution(tabs: list[int], valid_tabs: list[int] | None = None) -> PhaseDistribution:
+def get_phase_distribution(tabs: list[int], valid_tabs: Collection[int] | None = None) -> PhaseDistribution:
     """Analyze phase distribution across a list of tabs.
 
     Args:
         tabs: list of tab numbers to analyze
-        valid_tabs: Optional list of valid tab numbers from panel data
+        valid_tabs: Optional collection of valid tab numbers from panel data
 
     Returns:
         Dictionary with phase distribution analysis:
@@ -133,6 +134,11 @@ def get_phase_distribution(tabs: list[int], valid_tabs: list[int] | None = None)
     l1_tabs = []
     l2_tabs = []
 
+    # Membership is tested once per tab; hash the valid set once rather
+    # than scanning a list for every tab.
+    if valid_tabs is not None:
+        valid_tabs = frozenset(valid_tabs)
+
     for tab in tabs:
         try:
             phase = get_tab_phase(tab, valid_tabs)
@@ -157,12 +163,12 @@ def get_phase_distribution(tabs: list[int], valid_tabs: list[int] | None = None)
     }  # Allow 1-tab difference
 
 
-def suggest_balanced_pairing(available_tabs: list[int], valid_tabs: list[int] | None = None) -> list[tuple[int, int]]:
+def suggest_balanced_pairing(available_tabs: list[int], valid_tabs: Collection[int] | None = None) -> list[tuple[int, int]]:
     """Suggest balanced tab pairings for 240V circuits.
 
     Args:
         available_tabs: list of available tab positions
-        valid_tabs: Optional list of valid tab numbers from panel data
+        valid_tabs: Optional collection of valid tab numbers from panel data
 
     Returns:
         list of (tab1, tab2) tuples representing suggested opposite-phase pairs
@@ -9,7 +9,7 @@ Covers:
 - /set topics ignored
 - Dirty tracking: property change marks dirty, same value doesn't, target change marks dirty,
   description marks all dirty, mark_clean clears
-- Node queries: find_node_by_type, nodes_by_type, all_node_types
+- Node queries: find_node_by_type, nodes_by_type, all_node_types, node_types_view
 - Callbacks: fire on change only, not on same value, unregister works, exception doesn't propagate
 """
 
@@ -247,6 +247,23 @@ class TestLifecycleReboot:
         assert "circuit-2" in dirty
         assert "bess-0" in dirty
 
+    def test_reboot_identical_description_not_reparsed(self):
+        """A re-delivered identical $description skips JSON parsing but still drives the lifecycle."""
+        acc = HomiePropertyAccumulator(SERIAL)
+        _make_ready(acc)
+        acc.mark_clean()
+
+        acc.handle_message(f"{PREFIX}/$state", "disconnected")
+        acc.handle_message(f"{PREFIX}/$state", "init")
+        with patch("span_panel_api.mqtt.accumulator.json.loads") as loads:
+            acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
+            acc.handle_message(f"{PREFIX}/$state", "ready")
+
+        loads.assert_not_called()
+        assert acc.lifecycle == HomieLifecycle.READY
+        assert acc.get_node_type("bess-0") == "energy.ebus.device.bess"
+        assert "circuit-1" in acc.dirty_node_ids()
+
     def test_reboot_timestamps_preserved(self):
         """Timestamps are not cleared during reboot — only updated on new values."""
         acc = HomiePropertyAccumulator(SERIAL)
@@ -289,6 +306,17 @@ class TestLifecycleInvalidDescription:
         assert acc.lifecycle == HomieLifecycle.CONNECTED
         assert not acc.is_ready()
 
+    def test_non_object_description_rejected_without_parsing(self):
+        acc = HomiePropertyAccumulator(SERIAL)
+        _make_ready(acc)
+        with patch("span_panel_api.mqtt.accumulator.json.loads") as loads:
+            acc.handle_message(f"{PREFIX}/$description", '["core"]')
+            acc.handle_message(f"{PREFIX}/$description", '"core"')
+
+        loads.assert_not_called()
+        assert acc.lifecycle == HomieLifecycle.READY
+        assert acc.get_node_type("core") == "energy.ebus.device.distribution-enclosure.core"
+
 
 # ---------------------------------------------------------------------------
 # Lifecycle: wrong serial
@@ -357,6 +385,15 @@ class TestTimestampTracking:
         ts2 = acc.get_timestamp("core", "power")
         assert ts2 >= ts1
 
+    def test_unchanged_value_skips_clock_read(self):
+        acc = HomiePropertyAccumulator(SERIAL)
+        with patch("span_panel_api.mqtt.accumulator.time") as mock_time:
+            mock_time.time.return_value = 1_700_000_000.5
+            acc.handle_message(f"{PREFIX}/core/power", "100")
+            acc.handle_message(f"{PREFIX}/core/power", "100")
+        assert acc.get_timestamp("core", "power") == 1_700_000_000
+        assert mock_time.time.call_count == 1
+
 
 # ---------------------------------------------------------------------------
 # Target storage
@@ -468,6 +505,19 @@ class TestNodeQueries:
         acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
         assert acc.find_node_by_type("nonexistent") is None
 
+    def test_find_node_by_type_refreshed_by_new_description(self):
+        acc = HomiePropertyAccumulator(SERIAL)
+        acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
+        assert acc.find_node_by_type("energy.ebus.device.bess") == "bess-0"
+        assert acc.find_node_by_type("energy.ebus.device.pv") is None
+
+        acc.handle_message(
+            f"{PREFIX}/$description",
+            _desc({"bess-1": {"type": "energy.ebus.device.bess"}, "pv-0": {"type": "energy.ebus.device.pv"}}),
+        )
+        assert acc.find_node_by_type("energy.ebus.device.bess") == "bess-1"
+        assert acc.find_node_by_type("energy.ebus.device.pv") == "pv-0"
+
     def test_nodes_by_type(self):
         acc = HomiePropertyAccumulator(SERIAL)
         acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
@@ -487,6 +537,27 @@ class TestNodeQueries:
         assert types["bess-0"] == "energy.ebus.device.bess"
         assert len(types) == 4
 
+    def test_all_node_types_returns_independent_copy(self):
+        acc = HomiePropertyAccumulator(SERIAL)
+        acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
+        types = acc.all_node_types()
+        types["core"] = "other"
+        acc.handle_message(f"{PREFIX}/$description", '{"nodes": {}}')
+        assert types["core"] == "other"
+        assert len(types) == 4
+        assert acc.get_node_type("core") == ""
+
+    def test_node_types_view_is_live_and_read_only(self):
+        acc = HomiePropertyAccumulator(SERIAL)
+        acc.handle_message(f"{PREFIX}/$description", SIMPLE_DESC)
+        view = acc.node_types_view()
+        assert acc.node_types_view() is view
+        assert dict(view) == acc.all_node_types()
+        with pytest.raises(TypeError):
+            view["core"] = "other"  # type: ignore[index]
+        acc.handle_message(f"{PREFIX}/$description", '{"nodes": {}}')
+        assert len(view) == 0
+
 
 # ---------------------------------------------------------------------------
 # Callbacks
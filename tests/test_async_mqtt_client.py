@@ -25,6 +25,9 @@ class TestNullLock:
         result2 = lock.__enter__()
         assert result1 is result2
 
+    def test_instances_carry_no_dict(self) -> None:
+        assert not hasattr(NullLock(), "__dict__")
+
 
 class TestAsyncMQTTClient:
     """Verify AsyncMQTTClient.setup() replaces all paho locks."""
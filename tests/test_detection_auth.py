@@ -1,11 +1,18 @@
 """Tests for v2 REST Endpoints & Detection."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
-from span_panel_api._http import _build_url, _get_client
+import span_panel_api._http as _http_mod
+from span_panel_api._http import _build_url, _create_ssl_context, _get_client
 from span_panel_api.detection import detect_api_version
 from span_panel_api.exceptions import (
     SpanPanelAPIError,
@@ -30,6 +37,19 @@ from span_panel_api.auth import (
 )
 
 
+# Expected error-message patterns, compiled once for pytest.raises(match=...)
+_MATCH_REGISTER_MISSING_FIELDS = re.compile(r"missing ebusBrokerPassword, hostname")
+_MATCH_401 = re.compile(r"401")
+_MATCH_403 = re.compile(r"403")
+_MATCH_412 = re.compile(r"412")
+_MATCH_422 = re.compile(r"422")
+_MATCH_500 = re.compile(r"500")
+_MATCH_NOT_PEM = re.compile(r"not a valid PEM")
+_MATCH_SPACE = re.compile(r"space")
+_MATCH_FORMAT = re.compile(r"format")
+_MATCH_NO_V2 = re.compile(r"does not support v2")
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -71,11 +91,27 @@ class TestHttpHelpers:
             mock_instance.__aenter__.assert_awaited_once()
             mock_instance.__aexit__.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_ssl_context_built_once_under_concurrency(self) -> None:
+        sentinel = MagicMock()
+        with patch("span_panel_api._http.ssl.create_default_context", return_value=sentinel) as mock_create:
+            results = await asyncio.gather(*(_create_ssl_context() for _ in range(5)))
+
+        assert all(ctx is sentinel for ctx in results)
+        mock_create.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_ssl_context_cached_path_skips_lock(self) -> None:
+        sentinel = MagicMock()
+        _http_mod._ssl_cache.context = sentinel
+
+        assert await _create_ssl_context() is sentinel
+        # Steady state never allocates or acquires the lock.
+        assert _http_mod._ssl_cache.lock is None
+
 
 def _mock_response(status_code: int = 200, json_data: dict | None = None, text: str = "") -> httpx.Response:
     """Build a mock httpx.Response."""
-    import json
-
     if json_data is not None:
         content = json.dumps(json_data).encode()
         headers = {"content-type": "application/json"}
@@ -91,6 +127,20 @@ def _mock_response(status_code: int = 200, json_data: dict | None = None, text:
     )
 
 
+@contextmanager
+def _patched_async_client(method: str, *, return_value=None, side_effect=None) -> Iterator[AsyncMock]:
+    """Patch the fallback ``httpx.AsyncClient`` so ``method`` returns or raises as given."""
+    with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
+        mock_client = AsyncMock()
+        request = getattr(mock_client, method)
+        request.return_value = return_value
+        request.side_effect = side_effect
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client_cls.return_value = mock_client
+        yield mock_client
+
+
 V2_STATUS_JSON = {"serialNumber": "nj-2316-XXXX", "firmwareVersion": "spanos2/r202603/05"}
 
 V2_AUTH_JSON = {
@@ -308,6 +358,20 @@ class TestRegisterV2:
         assert result.serial_number == "nj-2316-XXXX"
         assert result.hop_passphrase == "hop-secret"
 
+    @pytest.mark.asyncio
+    async def test_register_missing_fields_raises_api_error(self):
+        incomplete = {k: v for k, v in V2_AUTH_JSON.items() if k not in ("ebusBrokerPassword", "hostname")}
+        mock_response = _mock_response(200, incomplete)
+        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = mock_response
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            mock_client_cls.return_value = mock_client
+
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_REGISTER_MISSING_FIELDS):
+                await register_v2("192.168.65.70", "HA", "pass")
+
     @pytest.mark.asyncio
     async def test_register_invalid_passphrase(self):
         mock_response = _mock_response(422, text="Invalid passphrase")
@@ -318,7 +382,7 @@ class TestRegisterV2:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAuthError, match="422"):
+            with pytest.raises(SpanPanelAuthError, match=_MATCH_422):
                 await register_v2("192.168.65.70", "HA", "wrong")
 
     @pytest.mark.asyncio
@@ -376,7 +440,7 @@ class TestDownloadCaCert:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAPIError, match="not a valid PEM"):
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_NOT_PEM):
                 await download_ca_cert("192.168.65.70")
 
     @pytest.mark.asyncio
@@ -389,7 +453,7 @@ class TestDownloadCaCert:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAPIError, match="500"):
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_500):
                 await download_ca_cert("192.168.65.70")
 
 
@@ -429,8 +493,7 @@ class TestGetHomieSchema:
         core_type = result.types["energy.ebus.device.distribution-enclosure.core"]
         assert "door" in core_type
 
-    @pytest.mark.asyncio
-    async def test_schema_frozen(self):
+    def test_schema_frozen(self):
         result = V2HomieSchema(firmware_version="fw", types_schema_hash="hash", types={})
         with pytest.raises(AttributeError):
             result.firmware_version = "changed"  # type: ignore[misc]
@@ -454,32 +517,22 @@ class TestGetHomieSchema:
         schema = V2HomieSchema(firmware_version="fw", types_schema_hash="hash", types=types)
         assert schema.panel_size == 40
 
-    def test_panel_size_missing_circuit_type_raises(self):
-        schema = V2HomieSchema(firmware_version="fw", types_schema_hash="hash", types={})
-        with pytest.raises(ValueError, match="space"):
-            _ = schema.panel_size
-
-    def test_panel_size_missing_space_property_raises(self):
-        types = {"energy.ebus.device.circuit": {"name": {"datatype": "string"}}}
-        schema = V2HomieSchema(firmware_version="fw", types_schema_hash="hash", types=types)
-        with pytest.raises(ValueError, match="space"):
-            _ = schema.panel_size
-
-    def test_panel_size_bad_format_raises(self):
-        types = {
-            "energy.ebus.device.circuit": {
-                "space": {"datatype": "integer", "format": "invalid"},
-            },
-        }
+    @pytest.mark.parametrize(
+        ("types", "match"),
+        [
+            ({}, _MATCH_SPACE),
+            ({"energy.ebus.device.circuit": {"name": {"datatype": "string"}}}, _MATCH_SPACE),
+            ({"energy.ebus.device.circuit": {"space": {"datatype": "integer", "format": "invalid"}}}, _MATCH_FORMAT),
+        ],
+        ids=["missing-circuit-type", "missing-space-property", "bad-format"],
+    )
+    def test_panel_size_invalid_schema_raises(self, types, match):
         schema = V2HomieSchema(firmware_version="fw", types_schema_hash="hash", types=types)
-        with pytest.raises(ValueError, match="format"):
+        with pytest.raises(ValueError, match=match):
             _ = schema.panel_size
 
     def test_panel_size_from_live_fixture(self):
         """panel_size works with the real panel schema fixture."""
-        import json
-        from pathlib import Path
-
         fixture = Path(__file__).parent / "fixtures" / "v2" / "homie_schema.json"
         data = json.loads(fixture.read_text())
         schema = V2HomieSchema(
@@ -520,7 +573,7 @@ class TestRegeneratePassphrase:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAuthError, match="401"):
+            with pytest.raises(SpanPanelAuthError, match=_MATCH_401):
                 await regenerate_passphrase("192.168.65.70", "bad-token")
 
     @pytest.mark.asyncio
@@ -533,7 +586,7 @@ class TestRegeneratePassphrase:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAuthError, match="412"):
+            with pytest.raises(SpanPanelAuthError, match=_MATCH_412):
                 await regenerate_passphrase("192.168.65.70", "")
 
 
@@ -545,14 +598,7 @@ class TestRegeneratePassphrase:
 class TestRegisterFqdn:
     @pytest.mark.asyncio
     async def test_register_fqdn_success(self):
-        mock_response = _mock_response(200)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
+        with _patched_async_client("post", return_value=_mock_response(200)) as mock_client:
             await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
 
         mock_client.post.assert_called_once()
@@ -560,90 +606,36 @@ class TestRegisterFqdn:
         assert call_kwargs.kwargs["json"] == {"ebusTlsFqdn": "panel.example.com"}
 
     @pytest.mark.asyncio
-    async def test_register_fqdn_accepts_201(self):
-        mock_response = _mock_response(201)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
-
-    @pytest.mark.asyncio
-    async def test_register_fqdn_accepts_204(self):
-        mock_response = _mock_response(204)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
+    @pytest.mark.parametrize("status_code", [201, 204])
+    async def test_register_fqdn_accepts_success_status(self, status_code):
+        with _patched_async_client("post", return_value=_mock_response(status_code)):
             await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
 
     @pytest.mark.asyncio
-    async def test_register_fqdn_auth_error(self):
-        mock_response = _mock_response(401)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            with pytest.raises(SpanPanelAuthError, match="401"):
-                await register_fqdn("192.168.65.70", "bad-token", "panel.example.com")
-
-    @pytest.mark.asyncio
-    async def test_register_fqdn_403(self):
-        mock_response = _mock_response(403)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            with pytest.raises(SpanPanelAuthError, match="403"):
-                await register_fqdn("192.168.65.70", "bad-token", "panel.example.com")
-
-    @pytest.mark.asyncio
-    async def test_register_fqdn_api_error(self):
-        mock_response = _mock_response(500)
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            with pytest.raises(SpanPanelAPIError, match="500"):
-                await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
-
-    @pytest.mark.asyncio
-    async def test_register_fqdn_connection_error(self):
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = httpx.ConnectError("Connection refused")
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            with pytest.raises(SpanPanelConnectionError):
+    @pytest.mark.parametrize(
+        ("status_code", "error", "match"),
+        [
+            (401, SpanPanelAuthError, _MATCH_401),
+            (403, SpanPanelAuthError, _MATCH_403),
+            (500, SpanPanelAPIError, _MATCH_500),
+        ],
+    )
+    async def test_register_fqdn_http_error(self, status_code, error, match):
+        with _patched_async_client("post", return_value=_mock_response(status_code)):
+            with pytest.raises(error, match=match):
                 await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
 
     @pytest.mark.asyncio
-    async def test_register_fqdn_timeout(self):
-        with patch("span_panel_api._http.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = httpx.TimeoutException("Timed out")
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
-
-            with pytest.raises(SpanPanelTimeoutError):
+    @pytest.mark.parametrize(
+        ("side_effect", "error"),
+        [
+            (httpx.ConnectError("Connection refused"), SpanPanelConnectionError),
+            (httpx.TimeoutException("Timed out"), SpanPanelTimeoutError),
+        ],
+    )
+    async def test_register_fqdn_transport_error(self, side_effect, error):
+        with _patched_async_client("post", side_effect=side_effect):
+            with pytest.raises(error):
                 await register_fqdn("192.168.65.70", "jwt-token", "panel.example.com")
 
 
@@ -719,7 +711,7 @@ class TestGetFqdn:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAuthError, match="401"):
+            with pytest.raises(SpanPanelAuthError, match=_MATCH_401):
                 await get_fqdn("192.168.65.70", "bad-token")
 
     @pytest.mark.asyncio
@@ -732,7 +724,7 @@ class TestGetFqdn:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAPIError, match="500"):
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_500):
                 await get_fqdn("192.168.65.70", "jwt-token")
 
     @pytest.mark.asyncio
@@ -800,7 +792,7 @@ class TestDeleteFqdn:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAuthError, match="403"):
+            with pytest.raises(SpanPanelAuthError, match=_MATCH_403):
                 await delete_fqdn("192.168.65.70", "bad-token")
 
     @pytest.mark.asyncio
@@ -813,7 +805,7 @@ class TestDeleteFqdn:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAPIError, match="500"):
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_500):
                 await delete_fqdn("192.168.65.70", "jwt-token")
 
     @pytest.mark.asyncio
@@ -873,5 +865,5 @@ class TestGetV2Status:
             mock_client.__aexit__ = AsyncMock(return_value=False)
             mock_client_cls.return_value = mock_client
 
-            with pytest.raises(SpanPanelAPIError, match="does not support v2"):
+            with pytest.raises(SpanPanelAPIError, match=_MATCH_NO_V2):
                 await get_v2_status("192.168.1.1")
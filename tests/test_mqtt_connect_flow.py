@@ -7,6 +7,7 @@ SpanMqttClient full connect-to-snapshot flow.
 from __future__ import annotations
 
 import asyncio
+import json
 import ssl
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,11 +18,17 @@ from paho.mqtt.reasoncodes import ReasonCode
 from span_panel_api.exceptions import SpanPanelConnectionError
 from span_panel_api.mqtt.client import SpanMqttClient
 from span_panel_api.mqtt.connection import AsyncMqttBridge
-from span_panel_api.mqtt.const import MQTT_RECONNECT_MIN_DELAY_S
+from span_panel_api.mqtt.const import MQTT_RECONNECT_MIN_DELAY_S, TYPE_CIRCUIT, TYPE_CORE
+from span_panel_api.mqtt.homie import HomieDeviceConsumer
 from span_panel_api.mqtt.models import MqttClientConfig
 
 from conftest import MINIMAL_DESCRIPTION, SERIAL, TOPIC_PREFIX_SERIAL
 
+_LATE_NAMED_CIRCUITS = ("aabbccdd11223344556677889900aabb", "ffeeddcc998877665544332211009988")
+CIRCUIT_DESCRIPTION = json.dumps(
+    {"nodes": {"core": {"type": TYPE_CORE}, **{node: {"type": TYPE_CIRCUIT} for node in _LATE_NAMED_CIRCUITS}}}
+)
+
 
 def _make_bridge() -> AsyncMqttBridge:
     return AsyncMqttBridge(
@@ -237,6 +244,8 @@ class TestBridgeReconnect:
         bridge = _make_bridge()
         await bridge.connect()
         assert bridge._initial_connect_done is True
+        reconnected = asyncio.Event()
+        bridge.set_connection_callback(lambda connected: reconnected.set() if connected else None)
 
         # Simulate unexpected disconnect
         bridge._on_disconnect(
@@ -248,10 +257,11 @@ class TestBridgeReconnect:
         )
 
         assert bridge._reconnect_task is not None
-        # Let the reconnect loop run one iteration
-        await asyncio.sleep(MQTT_RECONNECT_MIN_DELAY_S + 0.1)
-        # reconnect should have been called and succeeded
+        # The first attempt runs before any backoff delay; wake as soon as
+        # its on_connect lands instead of sleeping out the minimum delay.
+        await asyncio.wait_for(reconnected.wait(), timeout=MQTT_RECONNECT_MIN_DELAY_S + 1.0)
         mqtt_client_mock.reconnect.assert_called()
+        assert bridge.is_connected()
 
         # Clean up
         await bridge.disconnect()
@@ -320,6 +330,75 @@ class TestSpanMqttClientConnect:
         assert await client.ping() is True
         mqtt_client_mock.subscribe.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_reconnect_same_schema_reuses_field_metadata(self, mqtt_client_mock: MagicMock) -> None:
+        """A second connect() with an unchanged schema hash skips rebuilding field metadata."""
+        client = _make_span_client()
+
+        connect_task = asyncio.create_task(client.connect())
+        await asyncio.sleep(0.05)
+        client._on_message(f"{TOPIC_PREFIX_SERIAL}/$description", MINIMAL_DESCRIPTION)
+        client._on_message(f"{TOPIC_PREFIX_SERIAL}/$state", "ready")
+        await asyncio.wait_for(connect_task, timeout=5.0)
+        first_metadata = client.field_metadata
+        await client.close()
+
+        with patch("span_panel_api.mqtt.client.build_field_metadata") as build:
+            connect_task = asyncio.create_task(client.connect())
+            await asyncio.sleep(0.05)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$description", MINIMAL_DESCRIPTION)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$state", "ready")
+            await asyncio.wait_for(connect_task, timeout=5.0)
+
+        build.assert_not_called()
+        assert client.field_metadata is first_metadata
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_wakes_when_late_circuit_names_arrive(self, mqtt_client_mock: MagicMock) -> None:
+        """connect() returns once every circuit name published after ready has landed."""
+        client = _make_span_client()
+        first, second = _LATE_NAMED_CIRCUITS
+
+        with patch.object(
+            HomieDeviceConsumer,
+            "circuit_nodes_missing_names",
+            autospec=True,
+            side_effect=HomieDeviceConsumer.circuit_nodes_missing_names,
+        ) as missing_names:
+            connect_task = asyncio.create_task(client.connect())
+            await asyncio.sleep(0.05)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$description", CIRCUIT_DESCRIPTION)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$state", "ready")
+            await asyncio.sleep(0)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/{first}/name", "Kitchen")
+            await asyncio.sleep(0)
+            assert not connect_task.done()
+
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/{second}/name", "Garage")
+            await asyncio.wait_for(connect_task, timeout=1.0)
+
+        # The missing set is collected once and then updated per name message
+        missing_names.assert_called_once()
+        assert client._accumulator is not None
+        assert client._accumulator._property_callbacks == []
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_circuit_names_timeout_is_non_fatal(self, mqtt_client_mock: MagicMock) -> None:
+        """Missing circuit names only log a warning once the wait times out."""
+        client = _make_span_client()
+
+        with patch("span_panel_api.mqtt.client._CIRCUIT_NAMES_TIMEOUT_S", 0.05):
+            connect_task = asyncio.create_task(client.connect())
+            await asyncio.sleep(0.05)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$description", CIRCUIT_DESCRIPTION)
+            client._on_message(f"{TOPIC_PREFIX_SERIAL}/$state", "ready")
+            await asyncio.wait_for(connect_task, timeout=1.0)
+
+        assert await client.ping() is True
+        await client.close()
+
     @pytest.mark.asyncio
     async def test_close(self, mqtt_client_mock: MagicMock) -> None:
         client = _make_span_client()
@@ -11,7 +11,7 @@ Exercises the snapshot_interval parameter and debounce logic:
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -44,6 +44,24 @@ async def _connect_client(client: SpanMqttClient, mqtt_client_mock: MagicMock) -
     await asyncio.wait_for(connect_task, timeout=5.0)
 
 
+async def _advance_loop_time(client: SpanMqttClient, seconds: float) -> None:
+    """Let the running loop act as if ``seconds`` had elapsed, without sleeping.
+
+    Shifts the loop's own clock, which ``call_later`` timers are scheduled
+    against, until any timer due within ``seconds`` has run, then awaits the
+    snapshot dispatch tasks those timers started so their callbacks complete.
+    """
+    loop = asyncio.get_running_loop()
+    real_time = loop.time
+    with patch.object(loop, "time", lambda: real_time() + seconds):
+        # Due timers are queued behind this task's wakeup, so they run
+        # during the first yield and are finished by the second.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    if client._background_tasks:
+        await asyncio.gather(*client._background_tasks)
+
+
 class TestSnapshotDebounce:
     """Test debounce timer behavior with snapshot_interval >= 1.0s.
 
@@ -129,8 +147,8 @@ class TestSnapshotDebounce:
         await client.close()
         assert client._snapshot_timer is None
 
-        # Wait past when the timer would have fired
-        await asyncio.sleep(1.2)
+        # Run past when the timer would have fired
+        await _advance_loop_time(client, 1.2)
         assert len(snapshots) == 0
 
     @pytest.mark.asyncio
@@ -150,7 +168,7 @@ class TestSnapshotDebounce:
         await client.stop_streaming()
         assert client._snapshot_timer is None
 
-        await asyncio.sleep(1.2)
+        await _advance_loop_time(client, 1.2)
         assert len(snapshots) == 0
 
         await client.close()
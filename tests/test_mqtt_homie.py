@@ -18,10 +18,11 @@ from __future__ import annotations
 
 import json
 import time
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
+from span_panel_api.exceptions import SpanPanelServerError
 from span_panel_api.mqtt.const import (
     HOMIE_STATE_READY,
     MQTT_DEFAULT_MQTTS_PORT,
@@ -37,8 +38,11 @@ from span_panel_api.mqtt.const import (
     TYPE_LUGS_UPSTREAM,
     TYPE_POWER_FLOWS,
     TYPE_PV,
+    denormalize_circuit_id,
+    normalize_circuit_id,
 )
 from span_panel_api.mqtt.accumulator import HomiePropertyAccumulator
+from span_panel_api.mqtt.client import SpanMqttClient
 from span_panel_api.mqtt.connection import AsyncMqttBridge
 from span_panel_api.mqtt.homie import HomieDeviceConsumer
 from span_panel_api.mqtt.models import MqttClientConfig
@@ -61,6 +65,9 @@ class _ConnectedBridge(AsyncMqttBridge):
 SERIAL = "nj-2316-XXXX"
 PREFIX = f"{TOPIC_PREFIX}/{SERIAL}"
 
+# Circuit ID → display name of every unmapped entry on an empty 4-space panel
+_UNMAPPED_TAB_NAMES_4 = {f"unmapped_tab_{n}": f"Unmapped Tab {n}" for n in range(1, 5)}
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -180,19 +187,13 @@ class TestHomieConsumerState:
 
 class TestHomieCircuitSnapshot:
     def test_circuit_id_normalization(self):
-        from span_panel_api.mqtt.const import normalize_circuit_id
-
         assert normalize_circuit_id("aabbccdd-1122-3344-5566-778899001122") == "aabbccdd11223344556677889900112" + "2"
 
     def test_circuit_id_denormalization(self):
-        from span_panel_api.mqtt.const import denormalize_circuit_id
-
         result = denormalize_circuit_id("aabbccdd11223344556677889900112" + "2")
         assert result == "aabbccdd-1122-3344-5566-778899001122"
 
     def test_denormalize_non_uuid(self):
-        from span_panel_api.mqtt.const import denormalize_circuit_id
-
         # Non-32-char strings pass through unchanged
         assert denormalize_circuit_id("short") == "short"
         # Already dashed passes through
@@ -543,6 +544,22 @@ class TestHomieDsmDerivation:
         snapshot = consumer.build_snapshot()
         assert snapshot.current_run_config == "UNKNOWN"
 
+    @pytest.mark.parametrize(
+        ("dsm_state", "grid_islandable", "dps", "expected"),
+        [
+            ("DSM_ON_GRID", None, None, "PANEL_ON_GRID"),
+            ("DSM_OFF_GRID", True, "BATTERY", "PANEL_BACKUP"),
+            ("DSM_OFF_GRID", True, "PV", "PANEL_OFF_GRID"),
+            ("DSM_OFF_GRID", True, "GENERATOR", "PANEL_OFF_GRID"),
+            ("DSM_OFF_GRID", True, None, "UNKNOWN"),
+            ("DSM_OFF_GRID", None, "BATTERY", "UNKNOWN"),
+            ("UNKNOWN", True, "BATTERY", "UNKNOWN"),
+        ],
+    )
+    def test_run_config_decision_table(self, dsm_state, grid_islandable, dps, expected):
+        """The decision table is stateless and needs no consumer instance."""
+        assert HomieDeviceConsumer._derive_run_config(dsm_state, grid_islandable, dps) == expected
+
 
 # ---------------------------------------------------------------------------
 # HomieDeviceConsumer — lugs
@@ -615,15 +632,15 @@ class TestHomieBattery:
         acc.handle_message(f"{PREFIX}/bess-0/soc", "85.5")
         acc.handle_message(f"{PREFIX}/bess-0/soe", "10.2")
 
-        snapshot = consumer.build_snapshot()
-        assert snapshot.battery.soe_percentage == 85.5
-        assert snapshot.battery.soe_kwh == 10.2
+        battery = consumer.build_snapshot().battery
+        assert battery.soe_percentage == 85.5
+        assert battery.soe_kwh == 10.2
 
     def test_no_battery_node(self):
         acc, consumer = _build_ready_consumer({"core": {"type": TYPE_CORE}})
-        snapshot = consumer.build_snapshot()
-        assert snapshot.battery.soe_percentage is None
-        assert snapshot.battery.soe_kwh is None
+        battery = consumer.build_snapshot().battery
+        assert battery.soe_percentage is None
+        assert battery.soe_kwh is None
 
     def test_battery_metadata(self):
         """BESS metadata properties are parsed into the battery snapshot."""
@@ -633,21 +650,21 @@ class TestHomieBattery:
         acc.handle_message(f"{PREFIX}/bess-0/product-name", "Powerwall 3")
         acc.handle_message(f"{PREFIX}/bess-0/nameplate-capacity", "13.5")
 
-        snapshot = consumer.build_snapshot()
-        assert snapshot.battery.vendor_name == "Tesla"
-        assert snapshot.battery.product_name == "Powerwall 3"
-        assert snapshot.battery.nameplate_capacity_kwh == 13.5
+        battery = consumer.build_snapshot().battery
+        assert battery.vendor_name == "Tesla"
+        assert battery.product_name == "Powerwall 3"
+        assert battery.nameplate_capacity_kwh == 13.5
 
     def test_battery_metadata_absent(self):
         """BESS node without metadata properties has None values."""
         acc, consumer = _build_ready_consumer()
         acc.handle_message(f"{PREFIX}/bess-0/soc", "50.0")
 
-        snapshot = consumer.build_snapshot()
-        assert snapshot.battery.soe_percentage == 50.0
-        assert snapshot.battery.vendor_name is None
-        assert snapshot.battery.product_name is None
-        assert snapshot.battery.nameplate_capacity_kwh is None
+        battery = consumer.build_snapshot().battery
+        assert battery.soe_percentage == 50.0
+        assert battery.vendor_name is None
+        assert battery.product_name is None
+        assert battery.nameplate_capacity_kwh is None
 
 
 # ---------------------------------------------------------------------------
@@ -675,22 +692,22 @@ class TestHomiePVMetadata:
         acc.handle_message(f"{PREFIX}/{circuit_uuid}/name", "Solar")
         acc.handle_message(f"{PREFIX}/{circuit_uuid}/space", "30")
 
-        snapshot = consumer.build_snapshot()
-        assert snapshot.pv.vendor_name == "Enphase"
-        assert snapshot.pv.product_name == "IQ8+"
-        assert snapshot.pv.nameplate_capacity_w == 3960.0
-        assert snapshot.pv.feed_circuit_id == "aabbccdd112233445566778899001122"
-        assert snapshot.pv.relative_position == "IN_PANEL"
+        pv = consumer.build_snapshot().pv
+        assert pv.vendor_name == "Enphase"
+        assert pv.product_name == "IQ8+"
+        assert pv.nameplate_capacity_w == 3960.0
+        assert pv.feed_circuit_id == "aabbccdd112233445566778899001122"
+        assert pv.relative_position == "IN_PANEL"
 
     def test_no_pv_node(self):
         """Without PV node, pv snapshot has None values."""
         acc, consumer = _build_ready_consumer({"core": {"type": TYPE_CORE}})
-        snapshot = consumer.build_snapshot()
-        assert snapshot.pv.vendor_name is None
-        assert snapshot.pv.product_name is None
-        assert snapshot.pv.nameplate_capacity_w is None
-        assert snapshot.pv.feed_circuit_id is None
-        assert snapshot.pv.relative_position is None
+        pv = consumer.build_snapshot().pv
+        assert pv.vendor_name is None
+        assert pv.product_name is None
+        assert pv.nameplate_capacity_w is None
+        assert pv.feed_circuit_id is None
+        assert pv.relative_position is None
 
     def test_pv_metadata_partial(self):
         """PV node with only some properties populated."""
@@ -702,12 +719,12 @@ class TestHomiePVMetadata:
         )
         acc.handle_message(f"{PREFIX}/pv-0/vendor-name", "Other")
 
-        snapshot = consumer.build_snapshot()
-        assert snapshot.pv.vendor_name == "Other"
-        assert snapshot.pv.product_name is None
-        assert snapshot.pv.nameplate_capacity_w is None
-        assert snapshot.pv.feed_circuit_id is None
-        assert snapshot.pv.relative_position is None
+        pv = consumer.build_snapshot().pv
+        assert pv.vendor_name == "Other"
+        assert pv.product_name is None
+        assert pv.nameplate_capacity_w is None
+        assert pv.feed_circuit_id is None
+        assert pv.relative_position is None
 
 
 # ---------------------------------------------------------------------------
@@ -792,49 +809,19 @@ class TestHomieLugsCurrent:
 
 
 class TestHomiePanelSize:
-    def test_panel_size_from_constructor(self):
-        """panel_size in snapshot comes from constructor argument."""
-        acc_local = HomiePropertyAccumulator(SERIAL)
-        consumer = HomieDeviceConsumer(acc_local, panel_size=32)
-        acc_local.handle_message(f"{PREFIX}/$state", HOMIE_STATE_READY)
-        acc_local.handle_message(f"{PREFIX}/$description", _make_description(_core_description()))
-        snapshot = consumer.build_snapshot()
-        assert snapshot.panel_size == 32
+    @pytest.mark.parametrize("panel_size", [32, 40])
+    def test_panel_size_from_constructor(self, panel_size):
+        """panel_size in snapshot comes from the constructor argument.
 
-    def test_panel_size_40(self):
-        """Different panel sizes are propagated correctly."""
+        Unmapped-tab filling up to panel_size is covered by
+        TestUnmappedTabSynthesis.test_unmapped_fills_to_panel_size.
+        """
         acc_local = HomiePropertyAccumulator(SERIAL)
-        consumer = HomieDeviceConsumer(acc_local, panel_size=40)
+        consumer = HomieDeviceConsumer(acc_local, panel_size=panel_size)
         acc_local.handle_message(f"{PREFIX}/$state", HOMIE_STATE_READY)
         acc_local.handle_message(f"{PREFIX}/$description", _make_description(_core_description()))
         snapshot = consumer.build_snapshot()
-        assert snapshot.panel_size == 40
-
-    def test_unmapped_tabs_use_panel_size(self):
-        """Unmapped tabs fill up to panel_size, not highest occupied tab."""
-        nodes = {
-            "core": {"type": TYPE_CORE},
-            "aaaaaaaa-1111-2222-3333-444444444444": {"type": TYPE_CIRCUIT},
-        }
-        acc_local = HomiePropertyAccumulator(SERIAL)
-        consumer = HomieDeviceConsumer(acc_local, panel_size=8)
-        acc_local.handle_message(f"{PREFIX}/$state", HOMIE_STATE_READY)
-        acc_local.handle_message(f"{PREFIX}/$description", _make_description(nodes))
-        # Circuit at space 2 only — tabs 3-8 should be unmapped
-        acc_local.handle_message(f"{PREFIX}/aaaaaaaa-1111-2222-3333-444444444444/space", "2")
-        acc_local.handle_message(f"{PREFIX}/aaaaaaaa-1111-2222-3333-444444444444/dipole", "false")
-
-        snapshot = consumer.build_snapshot()
-        unmapped_ids = sorted(cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_"))
-        assert unmapped_ids == [
-            "unmapped_tab_1",
-            "unmapped_tab_3",
-            "unmapped_tab_4",
-            "unmapped_tab_5",
-            "unmapped_tab_6",
-            "unmapped_tab_7",
-            "unmapped_tab_8",
-        ]
+        assert snapshot.panel_size == panel_size
 
 
 # ---------------------------------------------------------------------------
@@ -883,6 +870,61 @@ class TestSnapshotCaching:
         assert circuit.instant_power_w == 200.0
         assert snap2.firmware_version == snap1.firmware_version
 
+    def test_partial_rebuild_drops_unmapped_tab_claimed_by_circuit(self):
+        acc, consumer = _build_ready_consumer()
+        node = "aabbccdd-1122-3344-5566-778899001122"
+        acc.handle_message(f"{PREFIX}/{node}/space", "1")
+        snap1 = consumer.build_snapshot()
+        assert "unmapped_tab_7" in snap1.circuits
+
+        acc.handle_message(f"{PREFIX}/{node}/space", "7")
+        snap2 = consumer.build_snapshot()
+
+        assert "unmapped_tab_7" not in snap2.circuits
+        assert "unmapped_tab_1" in snap2.circuits
+        assert snap2.circuits["aabbccdd112233445566778899001122"].tabs == [7]
+
+    def test_partial_rebuild_reuses_feed_metadata(self):
+        circuit_uuid = "aabbccdd-1122-3344-5566-778899001122"
+        acc, consumer = _build_ready_consumer(
+            {
+                "core": {"type": TYPE_CORE},
+                circuit_uuid: {"type": TYPE_CIRCUIT},
+                "pv": {"type": TYPE_PV},
+            }
+        )
+        acc.handle_message(f"{PREFIX}/pv/feed", circuit_uuid)
+        acc.handle_message(f"{PREFIX}/pv/relative-position", "IN_PANEL")
+        consumer.build_snapshot()
+
+        acc.handle_message(f"{PREFIX}/{circuit_uuid}/active-power", "-50.0")
+        with patch.object(consumer, "_build_feed_metadata") as build_meta:
+            snap = consumer.build_snapshot()
+
+        build_meta.assert_not_called()
+        circuit = snap.circuits["aabbccdd112233445566778899001122"]
+        assert circuit.device_type == "pv"
+        assert circuit.relative_position == "IN_PANEL"
+        assert circuit.instant_power_w == 50.0
+
+    def test_dirty_feed_node_refreshes_feed_metadata(self):
+        circuit_uuid = "aabbccdd-1122-3344-5566-778899001122"
+        acc, consumer = _build_ready_consumer(
+            {
+                "core": {"type": TYPE_CORE},
+                circuit_uuid: {"type": TYPE_CIRCUIT},
+                "pv": {"type": TYPE_PV},
+            }
+        )
+        acc.handle_message(f"{PREFIX}/pv/feed", circuit_uuid)
+        acc.handle_message(f"{PREFIX}/pv/relative-position", "IN_PANEL")
+        consumer.build_snapshot()
+
+        acc.handle_message(f"{PREFIX}/pv/relative-position", "UPSTREAM")
+        snap = consumer.build_snapshot()
+
+        assert snap.circuits["aabbccdd112233445566778899001122"].relative_position == "UPSTREAM"
+
     def test_dirty_core_triggers_full_rebuild(self):
         acc, consumer = _build_ready_consumer()
         acc.handle_message(f"{PREFIX}/core/software-version", "v1")
@@ -995,8 +1037,6 @@ class TestHomieCallbacks:
 
 class TestSpanMqttClientProtocol:
     def test_capabilities(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
         caps = client.capabilities
@@ -1015,26 +1055,22 @@ class TestSpanMqttClientProtocol:
 class TestSpanMqttClientControl:
     @pytest.mark.asyncio
     async def test_set_circuit_relay_publishes(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
 
         mock_bridge = MagicMock()
         client._bridge = mock_bridge
 
-        await client.set_circuit_relay("aabbccdd112233445566778899001122", "OPEN")
+        targets = [("aabbccdd112233445566778899001122", "OPEN"), ("ffeeddcc998877665544332211009988", "CLOSED")]
+        for circuit_id, state in targets:
+            await client.set_circuit_relay(circuit_id, state)
 
-        mock_bridge.publish.assert_called_once_with(
-            f"{TOPIC_PREFIX}/{SERIAL}/aabbccdd112233445566778899001122/relay/set",
-            "OPEN",
-            qos=1,
-        )
+        assert mock_bridge.publish.call_args_list == [
+            call(f"{TOPIC_PREFIX}/{SERIAL}/{circuit_id}/relay/set", state, qos=1) for circuit_id, state in targets
+        ]
 
     @pytest.mark.asyncio
     async def test_set_circuit_priority_publishes(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
 
@@ -1051,8 +1087,6 @@ class TestSpanMqttClientControl:
 
     @pytest.mark.asyncio
     async def test_set_dominant_power_source_publishes(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
         client._accumulator = HomiePropertyAccumulator(SERIAL)
@@ -1076,9 +1110,6 @@ class TestSpanMqttClientControl:
 
     @pytest.mark.asyncio
     async def test_set_dominant_power_source_no_core_node_raises(self):
-        from span_panel_api.exceptions import SpanPanelServerError
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
         client._accumulator = HomiePropertyAccumulator(SERIAL)
@@ -1097,8 +1128,6 @@ class TestSpanMqttClientControl:
 class TestSpanMqttClientSnapshot:
     @pytest.mark.asyncio
     async def test_get_snapshot_returns_homie_state(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
         client._accumulator = HomiePropertyAccumulator(SERIAL)
@@ -1116,16 +1145,12 @@ class TestSpanMqttClientSnapshot:
 
     @pytest.mark.asyncio
     async def test_ping_false_no_bridge(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
         assert await client.ping() is False
 
     @pytest.mark.asyncio
     async def test_ping_true_when_connected_and_ready(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
 
@@ -1147,10 +1172,7 @@ class TestSpanMqttClientSnapshot:
 
 
 class TestSpanMqttClientStreaming:
-    @pytest.mark.asyncio
-    async def test_register_and_unregister_snapshot_callback(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
+    def test_register_and_unregister_snapshot_callback(self):
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
 
@@ -1162,8 +1184,6 @@ class TestSpanMqttClientStreaming:
 
     @pytest.mark.asyncio
     async def test_start_stop_streaming(self):
-        from span_panel_api.mqtt.client import SpanMqttClient
-
         config = MqttClientConfig(broker_host="h", username="u", password="p")
         client = SpanMqttClient(host="192.168.1.1", serial_number=SERIAL, broker_config=config)
 
@@ -1253,6 +1273,35 @@ class TestUnmappedTabSynthesis:
         circuit = snapshot.circuits["aaaaaaaa111122223333444444444444"]
         assert circuit.tabs == [3]
 
+    def test_negative_space_occupies_no_position(self):
+        """A malformed negative space leaves every position unmapped instead of failing."""
+        nodes = {
+            "core": {"type": TYPE_CORE},
+            "aaaaaaaa-1111-2222-3333-444444444444": {"type": TYPE_CIRCUIT},
+        }
+        acc, consumer = _build_ready_consumer(nodes)
+        node = "aaaaaaaa-1111-2222-3333-444444444444"
+        acc.handle_message(f"{PREFIX}/{node}/space", "-3")
+
+        snapshot = consumer.build_snapshot()
+        assert snapshot.circuits["aaaaaaaa111122223333444444444444"].tabs == [-3]
+        assert all(f"unmapped_tab_{tab}" in snapshot.circuits for tab in range(1, 33))
+
+    @pytest.mark.parametrize("space", ["4000000000", "99999999999999"])
+    def test_out_of_range_space_occupies_no_position(self, space):
+        """A malformed huge space is ignored for occupancy instead of building a huge bitmask."""
+        nodes = {
+            "core": {"type": TYPE_CORE},
+            "aaaaaaaa-1111-2222-3333-444444444444": {"type": TYPE_CIRCUIT},
+        }
+        acc, consumer = _build_ready_consumer(nodes)
+        node = "aaaaaaaa-1111-2222-3333-444444444444"
+        acc.handle_message(f"{PREFIX}/{node}/space", space)
+
+        snapshot = consumer.build_snapshot()
+        assert snapshot.circuits["aaaaaaaa111122223333444444444444"].tabs == [int(space)]
+        assert all(f"unmapped_tab_{tab}" in snapshot.circuits for tab in range(1, 33))
+
     def test_dipole_tabs(self):
         """Dipole circuit gets tabs = [space, space + 2] (same bus bar side)."""
         nodes = {
@@ -1341,6 +1390,27 @@ class TestUnmappedTabSynthesis:
         assert unmapped.is_sheddable is False
         assert unmapped.is_never_backup is False
 
+    def test_unmapped_tab_entries_not_shared_across_rebuilds(self):
+        """Mutating an unmapped entry's tabs list cannot leak into later snapshots."""
+        nodes = {
+            "core": {"type": TYPE_CORE},
+            "aaaaaaaa-1111-2222-3333-444444444444": {"type": TYPE_CIRCUIT},
+        }
+        acc_local = HomiePropertyAccumulator(SERIAL)
+        consumer = HomieDeviceConsumer(acc_local, panel_size=4)
+        acc_local.handle_message(f"{PREFIX}/$state", HOMIE_STATE_READY)
+        acc_local.handle_message(f"{PREFIX}/$description", _make_description(nodes))
+        acc_local.handle_message(f"{PREFIX}/aaaaaaaa-1111-2222-3333-444444444444/space", "1")
+
+        first = consumer.build_snapshot()
+        first.circuits["unmapped_tab_2"].tabs.append(99)
+        acc_local.handle_message(f"{PREFIX}/aaaaaaaa-1111-2222-3333-444444444444/active-power", "-50.0")
+        second = consumer.build_snapshot()
+
+        assert second is not first
+        assert second.circuits["unmapped_tab_2"] is not first.circuits["unmapped_tab_2"]
+        assert second.circuits["unmapped_tab_2"].tabs == [2]
+
     def test_fully_occupied_panel_no_unmapped(self):
         """When all positions are occupied, no unmapped tabs are generated."""
         nodes = {
@@ -1367,8 +1437,8 @@ class TestUnmappedTabSynthesis:
             acc_local.handle_message(f"{PREFIX}/{node}/dipole", "false")
 
         snapshot = consumer.build_snapshot()
-        unmapped_ids = [cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_")]
-        assert unmapped_ids == []
+        unmapped_ids = {cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_")}
+        assert unmapped_ids == set()
 
     def test_no_circuits_all_unmapped(self):
         """When no circuits exist, all positions up to panel_size are unmapped."""
@@ -1378,13 +1448,7 @@ class TestUnmappedTabSynthesis:
         acc_local.handle_message(f"{PREFIX}/$state", HOMIE_STATE_READY)
         acc_local.handle_message(f"{PREFIX}/$description", _make_description(nodes))
         snapshot = consumer.build_snapshot()
-        unmapped_ids = sorted(cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_"))
-        assert unmapped_ids == [
-            "unmapped_tab_1",
-            "unmapped_tab_2",
-            "unmapped_tab_3",
-            "unmapped_tab_4",
-        ]
+        assert {cid: circuit.name for cid, circuit in snapshot.circuits.items()} == _UNMAPPED_TAB_NAMES_4
 
     def test_no_space_property_all_unmapped(self):
         """Circuits without space property don't occupy any tabs."""
@@ -1398,13 +1462,13 @@ class TestUnmappedTabSynthesis:
         acc_local.handle_message(f"{PREFIX}/$description", _make_description(nodes))
         # Don't set space property — circuit has no tabs
         snapshot = consumer.build_snapshot()
-        unmapped_ids = sorted(cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_"))
-        assert unmapped_ids == [
+        unmapped_ids = {cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_")}
+        assert unmapped_ids == {
             "unmapped_tab_1",
             "unmapped_tab_2",
             "unmapped_tab_3",
             "unmapped_tab_4",
-        ]
+        }
 
     def test_unmapped_fills_to_panel_size(self):
         """Unmapped tabs fill up to panel_size even if circuit is at low tab."""
@@ -1421,8 +1485,8 @@ class TestUnmappedTabSynthesis:
 
         snapshot = consumer.build_snapshot()
         # Occupied: {2}, unmapped: {1,3,4,5,6,7,8}
-        unmapped_ids = sorted(cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_"))
-        assert unmapped_ids == [
+        unmapped_ids = {cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_")}
+        assert unmapped_ids == {
             "unmapped_tab_1",
             "unmapped_tab_3",
             "unmapped_tab_4",
@@ -1430,7 +1494,7 @@ class TestUnmappedTabSynthesis:
             "unmapped_tab_6",
             "unmapped_tab_7",
             "unmapped_tab_8",
-        ]
+        }
 
     def test_dipole_occupies_correct_tabs_in_unmapped_calc(self):
         """Dipole circuits remove both occupied tabs from unmapped set."""
@@ -1448,10 +1512,8 @@ class TestUnmappedTabSynthesis:
 
         snapshot = consumer.build_snapshot()
         # panel_size=4, occupied: {1, 3}, unmapped: {2, 4}
-        assert "unmapped_tab_1" not in snapshot.circuits
-        assert "unmapped_tab_2" in snapshot.circuits
-        assert "unmapped_tab_3" not in snapshot.circuits
-        assert "unmapped_tab_4" in snapshot.circuits
+        unmapped_ids = {cid for cid in snapshot.circuits if cid.startswith("unmapped_tab_")}
+        assert unmapped_ids == {"unmapped_tab_2", "unmapped_tab_4"}
 
 
 # ---------------------------------------------------------------------------
@@ -14,30 +14,37 @@ from span_panel_api.phase_validation import (
     get_phase_distribution,
 )
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@pytest.fixture(scope="module")
+def example_configs() -> Dict[str, Dict[str, Any]]:
+    """Load all example YAML configurations once for the module.
+
+    Every test only reads the parsed configs, so they are shared.
+    """
+    examples_dir = Path(__file__).parent / "fixtures" / "configs"
+    configs = {}
+
+    # Load all YAML files in examples directory
+    for yaml_file in examples_dir.glob("*.yaml"):
+        if yaml_file.name.startswith("test_") or yaml_file.name == "README.md":
+            continue
+
+        with open(yaml_file) as f:
+            try:
+                config = yaml.load(f, Loader=_YAML_LOADER)
+                configs[yaml_file.name] = config
+            except yaml.YAMLError as e:
+                pytest.fail(f"Failed to load {yaml_file.name}: {e}")
+
+    return configs
+
 
 class TestExamplePhaseValidation:
     """Test electrical phase validation for all example configurations."""
 
-    @pytest.fixture
-    def example_configs(self) -> Dict[str, Dict[str, Any]]:
-        """Load all example YAML configurations."""
-        examples_dir = Path(__file__).parent / "fixtures" / "configs"
-        configs = {}
-
-        # Load all YAML files in examples directory
-        for yaml_file in examples_dir.glob("*.yaml"):
-            if yaml_file.name.startswith("test_") or yaml_file.name == "README.md":
-                continue
-
-            with open(yaml_file) as f:
-                try:
-                    config = yaml.safe_load(f)
-                    configs[yaml_file.name] = config
-                except yaml.YAMLError as e:
-                    pytest.fail(f"Failed to load {yaml_file.name}: {e}")
-
-        return configs
-
     def test_all_examples_load_successfully(self, example_configs):
         """Test that all example YAML files load without errors."""
         assert len(example_configs) > 0, "No example configurations found"
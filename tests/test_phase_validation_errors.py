@@ -1,5 +1,7 @@
 """Tests for phase validation error paths and edge cases."""
 
+import re
+
 import pytest
 from span_panel_api.phase_validation import (
     get_tab_phase,
@@ -9,6 +11,12 @@ from span_panel_api.phase_validation import (
     suggest_balanced_pairing,
 )
 
+# Expected ValueError messages, compiled once for pytest.raises(match=...)
+_ERR_TAB_0_BELOW_ONE = re.compile(r"Tab number 0 must be >= 1")
+_ERR_TAB_NEG5_BELOW_ONE = re.compile(r"Tab number -5 must be >= 1")
+_ERR_TAB_2_NOT_FOUND = re.compile(r"Tab number 2 not found in panel branch data")
+_ERR_TAB_4_NOT_FOUND = re.compile(r"Tab number 4 not found in panel branch data")
+
 
 class TestPhaseValidationErrorPaths:
     """Test error handling and edge cases in phase validation."""
@@ -16,11 +24,11 @@ class TestPhaseValidationErrorPaths:
     def test_get_tab_phase_invalid_tab_number(self):
         """Test get_tab_phase with invalid tab numbers."""
         # Tab number outside valid range
-        with pytest.raises(ValueError, match="Tab number 0 must be >= 1"):
+        with pytest.raises(ValueError, match=_ERR_TAB_0_BELOW_ONE):
             get_tab_phase(0)
 
         # Negative tab number
-        with pytest.raises(ValueError, match="Tab number -5 must be >= 1"):
+        with pytest.raises(ValueError, match=_ERR_TAB_NEG5_BELOW_ONE):
             get_tab_phase(-5)
 
     def test_get_tab_phase_with_custom_valid_tabs(self):
@@ -32,10 +40,10 @@ class TestPhaseValidationErrorPaths:
         assert get_tab_phase(3, valid_tabs) == "L2"
 
         # Invalid tab not in the list
-        with pytest.raises(ValueError, match="Tab number 2 not found in panel branch data"):
+        with pytest.raises(ValueError, match=_ERR_TAB_2_NOT_FOUND):
             get_tab_phase(2, valid_tabs)
 
-        with pytest.raises(ValueError, match="Tab number 4 not found in panel branch data"):
+        with pytest.raises(ValueError, match=_ERR_TAB_4_NOT_FOUND):
             get_tab_phase(4, valid_tabs)
 
     def test_are_tabs_opposite_phase_with_invalid_tabs(self):
@@ -103,6 +111,16 @@ class TestPhaseValidationErrorPaths:
         assert distribution["L2_count"] == 2
         assert distribution["balance_difference"] == 1
 
+    def test_get_phase_distribution_accepts_any_valid_tabs_collection(self):
+        """valid_tabs may be a list, set, or range with identical results."""
+        tabs = [1, 2, 3, 4, 9]
+        expected = get_phase_distribution(tabs, list(range(1, 9)))
+
+        assert expected["L1_tabs"] == [1, 2]
+        assert expected["L2_tabs"] == [3, 4]
+        assert get_phase_distribution(tabs, set(range(1, 9))) == expected
+        assert get_phase_distribution(tabs, range(1, 9)) == expected
+
     def test_get_phase_distribution_all_invalid_tabs(self):
         """Test get_phase_distribution with all invalid tabs."""
         # Only negative tabs which are invalid